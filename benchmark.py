@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Measures cold start of the server: the time to import server.py in a fresh
+interpreter, the modules pulled in by that import with the highest self time,
+and the cost of parsing the config versus fetching it from cache.
+
+    python benchmark.py [runs]
+"""
+
+import os
+import sys
+import time
+import subprocess
+
+cwd = os.path.dirname(os.path.realpath(__file__))
+
+
+def import_time(module, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=cwd, check=True)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), sum(timings) / len(timings)
+
+
+def slowest_imports(module, count=10):
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    entries = []
+    for line in res.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        self_us = parts[0].rpartition(":")[2].strip()
+        if len(parts) != 3 or not self_us.isdigit():
+            continue
+        entries.append((int(self_us), int(parts[1]), parts[2].strip()))
+
+    return sorted(entries, reverse=True)[:count]
+
+
+def config_time():
+    from config import load_config
+
+    start = time.perf_counter()
+    load_config()
+    parsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load_config()
+    cached = time.perf_counter() - start
+
+    return parsed, cached
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    python_min, python_avg = import_time("os", runs)
+    server_min, server_avg = import_time("server", runs)
+    print(f"interpreter startup: min {python_min * 1000:.1f}ms avg {python_avg * 1000:.1f}ms")
+    print(f"import server:       min {server_min * 1000:.1f}ms avg {server_avg * 1000:.1f}ms")
+
+    print("slowest imports (self / cumulative):")
+    for self_us, cumulative_us, name in slowest_imports("server"):
+        print(f"  {self_us / 1000:8.1f}ms {cumulative_us / 1000:8.1f}ms {name}")
+
+    parsed, cached = config_time()
+    print(f"load config: parsed {parsed * 1000:.2f}ms cached {cached * 1000:.4f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import yaml
+from functools import lru_cache
+from utils import get_prop, get_prop_by_keys
+
+cwd = os.path.dirname(os.path.realpath(__file__))
+
+
+class Config:
+    def __init__(self, config):
+        self.debug = get_prop(config, "debug", default=False)
+
+        self.google_apikey = get_prop_by_keys(config, "google", "apikey", required=True)
+        self.owm_apikey = get_prop_by_keys(
+            config, "openweathermap", "apikey", required=True
+        )
+        self.staticmaps_mapid = get_prop_by_keys(
+            config, "google", "staticmaps_mapid", required=True
+        )
+
+        self.location = (
+            str(get_prop(config, "location", required=True)).strip().replace(" ", "")
+        )
+
+        self.server_enabled = get_prop_by_keys(
+            config, "server", "enabled", default=True
+        )
+        self.server_alive_seconds = get_prop_by_keys(
+            config, "server", "aliveSeconds", default=60
+        )
+        self.server_max_serves = get_prop_by_keys(
+            config, "server", "maxServes", default=1
+        )
+
+        self.image_width = get_prop_by_keys(config, "image", "width", default=825)
+        self.image_height = get_prop_by_keys(config, "image", "height", default=1200)
+
+        self.mqtt_enabled = get_prop_by_keys(config, "mqtt", "enabled", default=False)
+        self.mqtt_host = get_prop_by_keys(config, "mqtt", "host", default="localhost")
+        self.mqtt_port = get_prop_by_keys(config, "mqtt", "port", default=1883)
+        self.mqtt_topic = get_prop_by_keys(
+            config, "mqtt", "topic", default="mqtt/eink-cal-client"
+        )
+
+        self.validate()
+
+    def validate(self):
+        if not self.location:
+            raise ValueError("location must not be empty")
+
+        for name in ["image_width", "image_height"]:
+            val = getattr(self, name)
+            if not isinstance(val, int) or val <= 0:
+                raise ValueError("{} must be a positive integer: {}".format(name, val))
+
+        for name in ["server_alive_seconds", "server_max_serves", "mqtt_port"]:
+            val = getattr(self, name)
+            if not isinstance(val, int) or val < 0:
+                raise ValueError(
+                    "{} must be a non-negative integer: {}".format(name, val)
+                )
+
+
+@lru_cache(maxsize=None)
+def load_config(path=os.path.join(cwd, "config.yaml")):
+    """
+    Parses and validates the config file once, subsequent calls for the
+    same path return the cached Config
+    """
+    with open(path) as f:
+        config = yaml.safe_load(f)
+
+    return Config(config)
@@ -1,15 +1,25 @@
 import time
-import requests
-from PIL import Image
-from googlemaps import Client, timezone
 
 
 class GoogleAPIService:
     def __init__(self, key):
         self.apikey = key
-        self.client = Client(key)
+        self._client = None
+
+    @property
+    def client(self):
+        # the static map url needs only the api key, so only build a
+        # googlemaps client once an api call actually requires one
+        if self._client is None:
+            from googlemaps import Client
+
+            self._client = Client(self.apikey)
+
+        return self._client
 
     def get_timezone(self, location):
+        from googlemaps import timezone
+
         tz = timezone(self.client, location)
         print(tz)
         return tz
@@ -52,6 +62,9 @@ class GoogleAPIService:
             return url
 
         def get_image(self, location, zoom=DEFAULT_ZOOM):
+            import requests
+            from PIL import Image
+
             r = requests.get(self.get_url(location, zoom))
             img = Image.open(r.raw)
 
@@ -2,25 +2,20 @@
 # -*- coding: utf-8 -*-
 
 import os
-import io
 import sys
-import yaml
 import time
 import threading
 import datetime as dt
 import logging.config
-import paho.mqtt.client as mqtt
-from utils import get_prop, get_prop_by_keys
+from config import load_config
 from views.calendar import CalendarPage
+from views.framebuffer import get_frame_buffer, bits_per_pixel
 from google.api import GoogleAPIService
 from weather.weather import WeatherService
-from werkzeug.serving import make_server
-from flask import Flask, send_file, abort
 
 cwd = os.path.dirname(os.path.realpath(__file__))
 log = None
 
-app = Flask(__name__)
 # number of times served
 server_num_serves = 0
 server_max_serves = 1
@@ -29,48 +24,23 @@ server_max_serves = 1
 def main():
     global log, server_max_serves
 
-    config_file = open(os.path.join(cwd, "config.yaml"))
-    config = yaml.safe_load(config_file)
+    config = load_config()
 
-    debug = get_prop(config, "debug", default=False)
     # Create and configure logger
     log_ini_path = os.path.join(cwd, "logging.ini")
-    if debug:
+    if config.debug:
         logging.config.fileConfig(os.path.join(cwd, "logging.dev.ini"))
     logging.config.fileConfig(log_ini_path)
     log = logging.getLogger("server")
 
-    google_apikey = get_prop_by_keys(config, "google", "apikey", required=True)
-    owm_apikey = get_prop_by_keys(config, "openweathermap", "apikey", required=True)
+    server_max_serves = config.server_max_serves
 
-    staticmaps_mapid = get_prop_by_keys(
-        config, "google", "staticmaps_mapid", required=True
-    )
-
-    location = get_prop(config, "location", required=True).strip().replace(" ", "")
-
-    server_enabled = get_prop_by_keys(config, "server", "enabled", default=True)
-    server_alive_seconds = get_prop_by_keys(
-        config, "server", "aliveSeconds", default=60
-    )
-    server_max_serves = get_prop_by_keys(config, "server", "maxServes", default=1)
-
-    image_width = get_prop_by_keys(config, "image", "width", default=825)
-    image_height = get_prop_by_keys(config, "image", "height", default=1200)
-
-    mqtt_enabled = get_prop_by_keys(config, "mqtt", "enabled", default=False)
-    mqtt_host = get_prop_by_keys(config, "mqtt", "host", default="localhost")
-    mqtt_port = get_prop_by_keys(config, "mqtt", "port", default=1883)
-    mqtt_topic = get_prop_by_keys(
-        config, "mqtt", "topic", default="mqtt/eink-cal-client"
-    )
-
-    gapi = GoogleAPIService(google_apikey)
-    map_url = gapi.get_static_map_url(staticmaps_mapid, location)
+    gapi = GoogleAPIService(config.google_apikey)
+    map_url = gapi.get_static_map_url(config.staticmaps_mapid, config.location)
 
     weather_svc = WeatherService(
-        owm_apikey,
-        location,
+        config.owm_apikey,
+        config.location,
         debug=False,
     )
     current_forecast = weather_svc.current_forecast()
@@ -78,7 +48,7 @@ def main():
 
     try:
         # generate page images
-        page = CalendarPage(image_width, image_height)
+        page = CalendarPage(config.image_width, config.image_height)
         page.template(
             map_url=map_url,
             current_forecast=current_forecast,
@@ -89,18 +59,21 @@ def main():
         raise e
 
     # bail early if http server is not enabled
-    if not server_enabled:
+    if not config.server_enabled:
         sys.exit(0)
 
     # set up listener for client logs
     mqtt_client = None
-    if mqtt_enabled:
-        mqtt_client = get_client_mqtt_logging(mqtt_host, mqtt_port, mqtt_topic)
+    if config.mqtt_enabled:
+        mqtt_client = get_client_mqtt_logging(
+            config.mqtt_host, config.mqtt_port, config.mqtt_topic
+        )
 
     # setup http server
-    http_server = ServerThread(app)
+    http_server = ServerThread(create_app())
     http_server.start()
 
+    server_alive_seconds = config.server_alive_seconds
     enable_wait = server_alive_seconds > 0
     enable_max_serves = server_max_serves > 0
 
@@ -128,6 +101,8 @@ def main():
 
 
 def get_client_mqtt_logging(host, port, topic):
+    import paho.mqtt.client as mqtt
+
     mqtt_client = mqtt.Client("eink-cal-server")
     client_log = logging.getLogger("client")
 
@@ -167,6 +142,8 @@ def get_client_mqtt_logging(host, port, topic):
 
 class ServerThread(threading.Thread):
     def __init__(self, app, max_serves=1):
+        from werkzeug.serving import make_server
+
         threading.Thread.__init__(self)
         self.server = make_server("0.0.0.0", 8080, app)
         self.ctx = app.app_context()
@@ -183,34 +160,210 @@ class ServerThread(threading.Thread):
         self.server.shutdown()
 
 
-@app.route("/calendar.png")
+def create_app():
+    """
+    Builds the flask app, deferred so one-shot runs without the http server
+    never pay for importing flask
+    """
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.add_url_rule("/calendar.png", view_func=serve_cal_png)
+    app.add_url_rule("/calendar.bin", view_func=serve_cal_bin)
+
+    return app
+
+
 def serve_cal_png():
-    global server_num_serves, server_max_serves
     """
-    Returns the calendar image directly through send_file
+    Returns the calendar image, or the byte range asked for in the Range header
     """
+    from flask import abort
 
     path = os.path.join(cwd, "views/calendar.png")
+    fb = get_frame_buffer(path)
 
-    if not os.path.exists(path):
+    if fb is None:
         log.error(f"{path}: no such file exists")
         abort(404)
 
-    f = open(path, "rb")
-    stream = io.BytesIO(f.read())
+    return send_view(fb.png, fb, "image/png", os.path.basename(path))
+
+
+def serve_cal_bin():
+    """
+    Returns the calendar as a packed 4bpp grayscale framebuffer, see
+    FrameBuffer for the layout. Clients with little memory can fetch it in
+    bands of rows with ?rows=<first>-<last> (inclusive), and resume any
+    response with a Range header.
+    """
+    from flask import abort, request
+
+    path = os.path.join(cwd, "views/calendar.png")
+    fb = get_frame_buffer(path)
+
+    if fb is None:
+        log.error(f"{path}: no such file exists")
+        abort(404)
+
+    fb.decode()
+
+    start, stop = 0, fb.height
+    rows = request.args.get("rows")
+    if rows is not None:
+        start, stop = parse_rows(rows, fb.height)
+
+    headers = {
+        "X-Frame-Width": str(fb.width),
+        "X-Frame-Height": str(fb.height),
+        "X-Frame-Rows": f"{start}-{stop - 1}",
+        "X-Frame-Bpp": str(bits_per_pixel),
+        "X-Frame-Stride": str(fb.stride),
+        "X-Frame-Packing": "gray, 0=black 15=white, high nibble first, rows byte aligned",
+    }
+
+    return send_view(
+        fb.rows(start, stop),
+        fb,
+        "application/octet-stream",
+        f"calendar-{start}-{stop - 1}.bin",
+        headers=headers,
+        offset=start * fb.stride,
+        total=fb.height * fb.stride,
+    )
+
+
+def parse_rows(rows, height):
+    """
+    Parses a "<first>-<last>" row band, an open-ended "<first>-" or a single
+    "<row>" into a [start, stop) range clamped to the image height
+    """
+    from flask import abort
+
+    first, sep, last = rows.partition("-")
+    try:
+        start = int(first)
+        if not sep:
+            stop = start + 1
+        elif last == "":
+            stop = height
+        else:
+            stop = int(last) + 1
+    except ValueError:
+        abort(400, f"invalid rows: {rows}")
+
+    if start < 0 or stop <= start:
+        abort(400, f"invalid rows: {rows}")
+    if start >= height:
+        abort(416, f"rows {rows} out of range for height {height}")
+
+    return start, min(stop, height)
+
+
+def send_view(
+    view, fb, mimetype, download_name, headers=None, offset=0, total=None
+):
+    """
+    Streams a memoryview in chunks, honouring a single-range Range header so
+    interrupted downloads can resume. The view sits at offset within an image
+    of total bytes. A serve is only counted once every byte of the image has
+    been streamed, in any order and over any number of requests, so HEAD
+    requests, dropped connections and band or range fetches don't use up
+    maxServes part way through a download.
+    """
+    from flask import Response, request
+
+    length = len(view)
+    etag = f'"{fb.mtime}-{length}"'
+
+    headers = dict(headers or {})
+    headers["Accept-Ranges"] = "bytes"
+    headers["ETag"] = etag
+    headers["Content-Disposition"] = f"attachment; filename={download_name}"
+
+    start, stop = 0, length
+    status = 200
+
+    # multiple ranges aren't supported, send the whole view instead
+    use_range = request.range is not None and len(request.range.ranges) == 1
+
+    # only resume against a strong match of the current render, an older
+    # etag or an If-Range date gets the whole view
+    if_range = request.headers.get("If-Range")
+    if use_range and if_range is not None:
+        use_range = if_range.strip() == etag
+
+    if use_range:
+        byte_range = request.range.range_for_length(length)
+        if byte_range is None:
+            return Response(status=416, headers={"Content-Range": f"bytes */{length}"})
+
+        start, stop = byte_range
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{length}"
+
+    headers["Content-Length"] = str(stop - start)
+
+    on_sent = None
+    if request.method != "HEAD":
+        key = (fb.path, fb.mtime, mimetype)
+        total = length if total is None else total
+
+        def on_sent(begin, end):
+            mark_sent(key, total, offset + start + begin, offset + start + end)
+
+    return Response(
+        stream_view(view[start:stop], on_sent),
+        status=status,
+        mimetype=mimetype,
+        headers=headers,
+        direct_passthrough=True,
+    )
+
+
+def stream_view(view, on_sent=None, chunk_size=4096):
+    # wsgi servers only accept bytes, so copy out one bounded chunk at a time
+    for i in range(0, len(view), chunk_size):
+        chunk = view[i : i + chunk_size]
+        yield chunk.tobytes()
+
+        # resumed only once the server has written the chunk, so a chunk
+        # lost to a disconnect is never marked as sent
+        if on_sent is not None:
+            on_sent(i, i + len(chunk))
+
+
+# byte intervals of each image streamed so far, keyed by image and render
+served_intervals = {}
+
+
+def mark_sent(key, total, begin, end):
+    """
+    Records bytes [begin, end) of an image as sent, counting a serve once
+    they cover the whole image
+    """
+    merged = []
+    for b, e in sorted(served_intervals.get(key, []) + [(begin, end)]):
+        if merged and b <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((b, e))
+
+    if merged == [(0, total)]:
+        served_intervals.pop(key, None)
+        count_serve()
+    else:
+        served_intervals[key] = merged
+
+
+def count_serve():
+    global server_num_serves
 
     # incr number of times served
     server_num_serves += 1
     if server_max_serves > 0:
         log.info(f"Served {server_num_serves}/{server_max_serves} times")
 
-    return send_file(
-        stream,
-        mimetype="image/png",
-        as_attachment=True,
-        download_name=os.path.basename(path),
-    )
-
 
 if __name__ == "__main__":
     main()
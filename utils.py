@@ -9,7 +9,10 @@ def get_prop_by_keys(
     config, *keys, default=None, required=True, dehumanized=False
 ):
     val = default
-    found_vals = [get_by_path(config, keys)]
+    try:
+        found_vals = [get_by_path(config, keys)]
+    except (KeyError, TypeError):
+        found_vals = []
 
     if len(found_vals) == 0:
         if default is None and required is True:
@@ -1,5 +1,6 @@
 import datetime as dt
 from .page import Page
+from .icons import get_icon_atlas
 
 
 class CalendarPage(Page):
@@ -10,6 +11,18 @@ class CalendarPage(Page):
     ):
         super().__init__("calendar", width, height)
 
+        # display width from styles.css: #icon-container is 14vw with its
+        # img at 90%
+        self.current_icon_size = round(width * 0.14 * 0.9)
+
+        self.icons = get_icon_atlas()
+
+    def hourly_icon_size(self, num_forecasts):
+        # display width from styles.css: the fixed layout forecast table
+        # spans the 95% .container with one unpadded cell per forecast, and
+        # .hourly-forecast-icon is 80% of its cell
+        return round(self.image_width * 0.95 / max(1, num_forecasts) * 0.8)
+
     def template(
         self,
         **kwargs,
@@ -18,6 +31,8 @@ class CalendarPage(Page):
         current_forecast = kwargs["current_forecast"]
         hourly_forecasts = kwargs["hourly_forecasts"]
 
+        hourly_icon_size = self.hourly_icon_size(len(hourly_forecasts))
+
         hours = []
         temps = []
         precip_percents = []
@@ -81,7 +96,11 @@ class CalendarPage(Page):
                         )
 
                         with a.div(id="icon-container", klass="numcircle"):
-                            a.img(src=current_forecast["icon"])
+                            a.img(
+                                src=self.icons.get(
+                                    current_forecast["icon"], self.current_icon_size
+                                )
+                            )
 
                 with a.div(id="map-container"):
                     a.img(src=map_url, id="map")
@@ -118,7 +137,12 @@ class CalendarPage(Page):
                                                 with a.div(
                                                     klass="hourly-forecast-icon fc-icon"
                                                 ):
-                                                    a.img(src=forecast["icon"])
+                                                    a.img(
+                                                        src=self.icons.get(
+                                                            forecast["icon"],
+                                                            hourly_icon_size,
+                                                        )
+                                                    )
 
                         a.canvas(id="rain-temp-chart", height="130")
 
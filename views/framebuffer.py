@@ -0,0 +1,93 @@
+import io
+import os
+import threading
+
+# grey levels the panel can display, and the bits per pixel of the packed
+# framebuffer needed to hold them
+palette_levels = 16
+bits_per_pixel = 4
+
+
+class FrameBuffer:
+    """
+    In-memory copy of a rendered page image, held both as the encoded png and
+    as a packed grayscale framebuffer: pixels quantized to palette_levels
+    greys (0 black, 15 white), two per byte with the left pixel in the high
+    nibble, each row padded to a whole byte and rows stored top to bottom.
+    Both are exposed as memoryviews so byte ranges and row bands can be
+    sliced without copying the buffer.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+
+        with open(path, "rb") as f:
+            self._png = f.read()
+
+        self._pixels = None
+        self.width = None
+        self.height = None
+        self.stride = None
+        self._lock = threading.Lock()
+
+    @property
+    def png(self):
+        return memoryview(self._png)
+
+    @property
+    def pixels(self):
+        self.decode()
+        return memoryview(self._pixels)
+
+    def decode(self):
+        """
+        Decodes the packed framebuffer and its dimensions, on first band
+        request only so plain png fetches never pay for it
+        """
+        with self._lock:
+            if self._pixels is None:
+                from PIL import Image
+
+                # decode the cached bytes so pixels always match mtime/etag,
+                # even if the file was re-rendered since
+                with Image.open(io.BytesIO(self._png)) as img:
+                    img = img.convert("L")
+
+                step = 255 / (palette_levels - 1)
+                img = img.point(lambda v: round(v / step))
+
+                self.width, self.height = img.size
+                self.stride = (self.width * bits_per_pixel + 7) // 8
+                self._pixels = Image.frombytes("P", img.size, img.tobytes()).tobytes(
+                    "raw", f"P;{bits_per_pixel}"
+                )
+
+    def rows(self, start, stop):
+        """
+        Returns a view over rows [start, stop) of the packed framebuffer
+        """
+        pixels = self.pixels
+        return pixels[start * self.stride : stop * self.stride]
+
+
+frame_buffers = {}
+frame_buffers_lock = threading.Lock()
+
+
+def get_frame_buffer(path):
+    """
+    Returns the cached FrameBuffer for path, reloading it only when the file
+    on disk has been re-rendered since it was cached
+    """
+    if not os.path.exists(path):
+        return None
+
+    mtime = os.path.getmtime(path)
+    with frame_buffers_lock:
+        fb = frame_buffers.get(path)
+        if fb is None or fb.mtime != mtime:
+            fb = FrameBuffer(path)
+            frame_buffers[path] = fb
+
+    return fb
@@ -0,0 +1,140 @@
+import io
+import os
+import base64
+import threading
+from functools import lru_cache
+from .framebuffer import palette_levels
+
+cwd = os.path.dirname(os.path.realpath(__file__))
+icon_dir = os.path.join(cwd, "html", "icon")
+# rendered icons persist here so later processes only load them
+icon_cache_dir = os.path.join(cwd, ".icon-cache")
+
+# openweathermap condition codes, each with a day (d) and night (n) variant
+weather_icon_ids = [
+    f"{code}{variant}"
+    for code in ["01", "02", "03", "04", "09", "10", "11", "13", "50"]
+    for variant in ["d", "n"]
+]
+
+# bump when render() changes so stale files in the disk cache are ignored
+render_version = 2
+
+
+class IconAtlas:
+    """
+    Weather icons scaled to their display size with grey and alpha quantized
+    to the panel's levels, keeping their transparency so they sit on
+    whatever is behind them. Icons are rendered on first use, persisted to
+    disk keyed on source mtime, size and render version, and held in memory
+    as data uris so a render neither decodes the 512px sources nor has
+    chrome downscale them.
+    """
+
+    def __init__(self, icon_ids=weather_icon_ids):
+        self.paths = {}
+        for icon_id in icon_ids:
+            path = os.path.join(icon_dir, f"{icon_id}.png")
+            if os.path.exists(path):
+                self.paths[icon_id] = path
+
+        self.icons = {}
+        self.blanks = {}
+        self._lock = threading.Lock()
+
+    def get(self, icon_id, size):
+        """
+        Returns the data uri for icon_id at the given width. Unknown icons fall
+        back to their day/night counterpart and then to a blank image, never
+        to a network fetch.
+        """
+        for candidate in [icon_id, self.counterpart(icon_id)]:
+            if candidate not in self.paths:
+                continue
+
+            with self._lock:
+                if (candidate, size) not in self.icons:
+                    self.icons[(candidate, size)] = self.load(
+                        self.paths[candidate], size
+                    )
+
+                return self.icons[(candidate, size)]
+
+        with self._lock:
+            if size not in self.blanks:
+                from PIL import Image
+
+                self.blanks[size] = self.encode(Image.new("LA", (size, size)))
+
+            return self.blanks[size]
+
+    @staticmethod
+    def counterpart(icon_id):
+        if icon_id.endswith("d"):
+            return icon_id[:-1] + "n"
+        if icon_id.endswith("n"):
+            return icon_id[:-1] + "d"
+
+        return icon_id
+
+    @classmethod
+    def load(cls, path, size):
+        name = os.path.splitext(os.path.basename(path))[0]
+        cache_path = os.path.join(
+            icon_cache_dir,
+            "{}-{}-{}-v{}-{}.png".format(
+                name, size, palette_levels, render_version, os.stat(path).st_mtime_ns
+            ),
+        )
+
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                return cls.to_uri(f.read())
+
+        data = cls.render(path, size)
+        try:
+            os.makedirs(icon_cache_dir, exist_ok=True)
+            with open(cache_path, "wb") as f:
+                f.write(data)
+        except OSError:
+            # a read-only checkout just renders again next time
+            pass
+
+        return cls.to_uri(data)
+
+    @classmethod
+    def render(cls, path, size):
+        from PIL import Image
+
+        with Image.open(path) as img:
+            img = img.convert("LA")
+            height = max(1, round(img.height * size / img.width))
+            img = img.resize((size, height), Image.LANCZOS)
+
+        # quantizes both the grey and alpha bands, the background behind an
+        # icon isn't known here (the current icon sits inverted on a black
+        # circle) so transparency is kept rather than flattened
+        step = 255 / (palette_levels - 1)
+        img = img.point(lambda v: round(round(v / step) * step))
+
+        return cls.to_png(img)
+
+    @classmethod
+    def encode(cls, img):
+        return cls.to_uri(cls.to_png(img))
+
+    @staticmethod
+    def to_png(img):
+        buf = io.BytesIO()
+        img.save(buf, format="png", optimize=True)
+
+        return buf.getvalue()
+
+    @staticmethod
+    def to_uri(data):
+        return "data:image/png;base64," + base64.b64encode(data).decode()
+
+
+@lru_cache(maxsize=None)
+def get_icon_atlas():
+    return IconAtlas()
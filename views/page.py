@@ -1,12 +1,52 @@
 import os
 import logging
 from time import sleep
-from PIL import Image
 from airium import Airium
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import WebDriverException
+
+cwd = os.path.dirname(os.path.realpath(__file__))
+# resolved chromedriver path, persisted so one-shot runs can skip
+# ChromeDriverManager's version lookup
+driver_path_cache = os.path.join(cwd, ".chromedriver-path")
+driver_path = None
+
+
+def get_driver_path():
+    """
+    Returns the chromedriver path and whether it came from the cache rather
+    than a fresh ChromeDriverManager install
+    """
+    global driver_path
+
+    if driver_path is not None and os.path.exists(driver_path):
+        return driver_path, True
+
+    path = None
+    if os.path.exists(driver_path_cache):
+        with open(driver_path_cache) as f:
+            path = f.read().strip()
+
+    cached = bool(path) and os.path.exists(path)
+    if not cached:
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        path = ChromeDriverManager().install()
+        try:
+            with open(driver_path_cache, "w") as f:
+                f.write(path)
+        except OSError:
+            # a read-only checkout just resolves again next time
+            pass
+
+    driver_path = path
+    return driver_path, cached
+
+
+def clear_driver_path():
+    global driver_path
+
+    driver_path = None
+    if os.path.exists(driver_path_cache):
+        os.remove(driver_path_cache)
 
 
 class Page:
@@ -31,7 +71,8 @@ class Page:
         )
 
     def save(self):
-        cwd = os.path.dirname(os.path.realpath(__file__))
+        from PIL import Image
+
         html_fp = os.path.join(cwd, "html", self.name + ".html")
         png_fp = os.path.join(cwd, self.name + ".png")
 
@@ -52,6 +93,13 @@ class Page:
         self.log.info("Screenshot captured and saved to file.")
 
     def _get_chromedriver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.common.exceptions import (
+            SessionNotCreatedException,
+            WebDriverException,
+        )
+
         opts = Options()
         opts.add_argument("--headless")
         opts.add_argument("--hide-scrollbars")
@@ -60,13 +108,25 @@ class Page:
 
         driver = None
         try:
-            driver = webdriver.Chrome(ChromeDriverManager().install(), options=opts)
+            path, cached = get_driver_path()
+            try:
+                driver = webdriver.Chrome(path, options=opts)
+            except SessionNotCreatedException as snce:
+                if not cached:
+                    raise snce
+
+                # cached driver no longer matches chrome after an update,
+                # so reinstall once
+                self.log.warning(snce)
+                clear_driver_path()
+                path, _ = get_driver_path()
+                driver = webdriver.Chrome(path, options=opts)
         except Exception as e:
             self.log.warning(e)
             try:
                 driver = webdriver.Chrome(options=opts)
             except WebDriverException as wde:
-                raise wde 
+                raise wde
 
         driver.set_window_rect(width=self.image_width, height=self.image_height)
 
@@ -1,7 +1,4 @@
-import os
 import json
-import requests
-from os.path import exists, abspath
 from datetime import datetime
 
 
@@ -16,15 +13,9 @@ class WeatherService:
 
         self.debug = debug
 
-    def get_icon(self, icon_id):
-        cwd = os.path.dirname(os.path.realpath(__file__))
-        local_path = os.path.join(cwd, "..", f"views/html/icon/{icon_id}.png")
-        if not exists(local_path):
-            return f"https://openweathermap.org/img/wnicon_id4x.png"
-
-        return abspath(local_path)
-
     def current_forecast(self):
+        import requests
+
         if self.debug:
             with open("weather/debug-current.json") as f:
                 data = json.load(f)
@@ -39,7 +30,7 @@ class WeatherService:
 
         forecast = {
             "dt": datetime.fromtimestamp(data["dt"]),
-            "icon": self.get_icon(data["weather"][0]["icon"]),
+            "icon": data["weather"][0]["icon"],
             "sunrise": datetime.fromtimestamp(data["sys"]["sunrise"]),
             "sunset": datetime.fromtimestamp(data["sys"]["sunset"]),
             "temp": {
@@ -64,6 +55,8 @@ class WeatherService:
         return forecast
 
     def three_hour_daily_forecast(self):
+        import requests
+
         if self.debug:
             with open("weather/debug-hourly.json") as f:
                 data = json.load(f)
@@ -86,7 +79,7 @@ class WeatherService:
             forecasts.append(
                 {
                     "dt": datetime.fromtimestamp(entry["dt"]),
-                    "icon": self.get_icon(entry["weather"][0]["icon"]),
+                    "icon": entry["weather"][0]["icon"],
                     "temp": {
                         "unit": "\N{DEGREE SIGN}C"
                         if self.units == "metric"
@@ -110,6 +103,8 @@ class WeatherService:
         return forecasts
 
     def get_coords(self, location):
+        import requests
+
         res = requests.get(
             self.baseurl
             + "/geo/1.0/direct?q={}&limit=1&appid={}".format(location, self.apikey)